@@ -0,0 +1,44 @@
+"""
+Persistent cache for data derived from tree-sitter parses (e.g. a program's
+source with main() removed), keyed by a hash of the source it came from, so
+unchanged coreutils files are not re-parsed on every run.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+
+CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'docker-build-coreutils', 'ast.sqlite')
+
+# sqlite3 connections may not be shared between threads (or forked processes)
+_local = threading.local()
+
+
+def _db():
+    """Open (once per thread) the cache database, creating it if needed."""
+    if getattr(_local, 'pid', None) != os.getpid():
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        # parallel workers share the file; wait on their locks instead of failing
+        _local.connection = sqlite3.connect(CACHE_PATH, timeout=30)
+        _local.connection.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB)")
+        _local.pid = os.getpid()
+    return _local.connection
+
+
+def content_key(kind, source):
+    """Cache key for `kind` of data derived from source (bytes)."""
+    return f"{kind}:{hashlib.sha256(source).hexdigest()}"
+
+
+def get(key):
+    """Return the cached bytes for key, or None."""
+    row = _db().execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def put(key, value):
+    """Store bytes under key."""
+    db = _db()
+    db.execute("INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)", (key, value))
+    db.commit()
@@ -0,0 +1,97 @@
+"""
+Minimal client for podman's libpod REST API over its unix socket, so frequent
+container queries reuse one keep-alive connection instead of forking the podman
+CLI each time. Only available when the podman API service is running (e.g.
+`systemctl --user start podman.socket`); callers fall back to the CLI otherwise.
+"""
+
+import http.client
+import json
+import os
+import socket
+import threading
+import urllib.parse
+
+API_PREFIX = '/v4.0.0/libpod'
+
+
+def socket_path():
+    """Path of the podman API socket, or None if there is none."""
+    host = os.environ.get('CONTAINER_HOST', '')
+    candidates = []
+    if host.startswith('unix://'):
+        candidates.append(host[len('unix://'):])
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        candidates.append(os.path.join(os.environ['XDG_RUNTIME_DIR'], 'podman', 'podman.sock'))
+    candidates.append('/run/podman/podman.sock')
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=30):
+        super().__init__('localhost', timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+class PodmanClient:
+    """One keep-alive connection to the podman API; safe to share between threads."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = _UnixHTTPConnection(path)
+
+    def request(self, method, path, **params):
+        """Send a libpod API request; returns (status, decoded JSON body or None)."""
+        url = API_PREFIX + path
+        if params:
+            url += '?' + urllib.parse.urlencode(params)
+        with self.lock:
+            try:
+                self.conn.request(method, url)
+                response = self.conn.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                # the service may have closed the idle connection; reconnect once
+                self.conn.close()
+                self.conn.request(method, url)
+                response = self.conn.getresponse()
+                body = response.read()
+        return response.status, (json.loads(body) if body else None)
+
+    def container_status(self, name):
+        """Return the container's state (e.g. 'running'), or '' if it does not exist."""
+        status, body = self.request('GET', f'/containers/{urllib.parse.quote(name)}/json')
+        if status == 404:
+            return ''
+        if status != 200:
+            raise OSError(f"podman API returned {status} for {name}")
+        return body['State']['Status']
+
+    def remove_container(self, name):
+        """Stop and remove a container; returns True on success (or if it did not exist)."""
+        status, _ = self.request('DELETE', f'/containers/{urllib.parse.quote(name)}', force='true')
+        return status in (200, 204, 404)
+
+
+_client = None
+_client_pid = None
+
+
+def client():
+    """The process's PodmanClient, or None if the API socket is not available."""
+    global _client, _client_pid
+    if _client_pid != os.getpid():
+        # a forked pool worker must not share its parent's connection
+        path = socket_path()
+        _client = PodmanClient(path) if path else None
+        _client_pid = os.getpid()
+    return _client
@@ -1,5 +1,11 @@
 
-from test_container_one_mull import run_build_execute_mutate_for_one_coreutils_program
+import json
+import multiprocessing
+import os
+import time
+
+from test_container_one_mull import (ORIGINAL_COREUTILS_PATH, append_results_csv,
+                                     run_build_execute_mutate_for_one_coreutils_program)
 
 default_progs = [
     "src/basenc", "src/basename", "src/cat", "src/chmod", "src/chown", "src/comm", 
@@ -18,25 +24,86 @@ default_progs = [
     "src/wc", "src/whoami", "src/yes"
 ]
 
+# Number of programs processed concurrently; each worker process gets its own
+# container (test_container_one_mull.container_name is keyed by PID)
+NUM_WORKERS = os.cpu_count() or 1
+# Split the cores between workers so their `make -j` runs don't oversubscribe the host
+MAKE_JOBS = max(1, (os.cpu_count() or 1) // NUM_WORKERS)
+# Programs already run in parallel, so each one tests its functions in a single container
+FUNCTION_WORKERS = 1
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+COREUTILS_SRC_DIR = os.path.join(ORIGINAL_COREUTILS_PATH, 'src')
+# Wall times (seconds) measured on previous runs, keyed by program name
+PROG_COSTS_PATH = os.path.join(SCRIPT_DIR, '.prog_costs.json')
+
+
+def load_prog_costs():
+    try:
+        with open(PROG_COSTS_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def order_by_cost(progs, costs):
+    """
+    Longest-first order so the slowest programs don't end up alone at the tail of
+    the pool. Uses measured wall times when every program has one, otherwise the
+    size of src/<prog>.c as a proxy.
+    """
+    names = [p.split("/")[-1] for p in progs]
+    if all(name in costs for name in names):
+        cost = dict(zip(progs, (costs[name] for name in names)))
+    else:
+        cost = {}
+        for p, name in zip(progs, names):
+            try:
+                cost[p] = os.stat(os.path.join(COREUTILS_SRC_DIR, f"{name}.c")).st_size
+            except OSError:
+                cost[p] = 0
+    return sorted(progs, key=cost.__getitem__, reverse=True)
+
+
+def _worker(program_name):
+    """Run the build/test/mutate pipeline for one program; returns (name, results, error, seconds)."""
+    program_name = program_name.split("/")[-1] #eg. "pwd"
+    print(f"\n{'='*70}")
+    print(f"Executing tests for coreutils program: {program_name}")
+    print('='*70)
+    start = time.monotonic()
+    try:
+        # the parent writes the results CSV, so concurrent workers never append to it
+        results = run_build_execute_mutate_for_one_coreutils_program(program_name, enable_mutation_testing=True,
+                                                                     jobs=MAKE_JOBS, num_workers=FUNCTION_WORKERS,
+                                                                     write_results=False)
+        return program_name, results or [], None, time.monotonic() - start
+    except (Exception, SystemExit) as e:  # SystemExit would otherwise kill the pool worker
+        return program_name, None, repr(e), time.monotonic() - start
+
 
 if __name__ == "__main__":
     success = 0
     failed = 0
     print(len(default_progs), " programs to execute tests for.")
-    for i, program_name in enumerate(default_progs, 1):
-        program_name = program_name.split("/")[-1] #eg. "pwd"
-        print(f"\n{'='*70}")
-        print(f"Executing tests for coreutils program: {program_name}")
-        print(f"[{i}/{len(default_progs)}] {program_name}")
-        print('='*70)
-        try:
-            run_build_execute_mutate_for_one_coreutils_program(program_name, enable_mutation_testing=True)
-            success += 1
-            print(f"✓ {program_name} DONE")
-        except Exception as e:
-            failed += 1
-            print(f"✗ {program_name} FAILED: {e}")
-            continue  # Keep going to next program
+    costs = load_prog_costs()
+    progs = order_by_cost(default_progs, costs)
+    with multiprocessing.Pool(processes=NUM_WORKERS) as pool:
+        for i, (program_name, results, err, seconds) in enumerate(pool.imap_unordered(_worker, progs), 1):
+            costs[program_name] = seconds
+            print(f"[{i}/{len(progs)}] {program_name} ({seconds:.0f}s)")
+            if results is not None:
+                append_results_csv(program_name, results)
+                success += 1
+                print(f"✓ {program_name} DONE")
+            else:
+                failed += 1
+                print(f"✗ {program_name} FAILED: {err}")
+        # let workers exit normally so they tear down their containers
+        pool.close()
+        pool.join()
+    with open(PROG_COSTS_PATH, 'w', encoding='utf-8') as f:
+        json.dump(costs, f, indent=2)
     print(f"\n{'='*70}")
     print(f"SUMMARY: {success} success, {failed} failed")
-    print('='*70)
\ No newline at end of file
+    print('='*70)
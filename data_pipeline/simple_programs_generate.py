@@ -1,5 +1,10 @@
 
-from test_gpt5_generation import generate_tests_for_one_coreutils_program
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from test_gpt5_generation import generate_tests_for_one_coreutils_program, initialize_batch_llm
+
+# Programs generated concurrently; each also runs LLM_WORKERS requests at once,
+# so the total number of in-flight API calls is PROGRAM_WORKERS * LLM_WORKERS
+PROGRAM_WORKERS = 4
 
 default_progs = [
     "src/basenc", "src/basename", "src/cat", "src/chmod", "src/chown", "src/comm", 
@@ -22,20 +27,27 @@ if __name__ == "__main__":
     success = 0
     failed = 0
     print(len(default_progs), " programs to generate tests for.")
-    for i, program_name in enumerate(default_progs, 1):
-        program_name = program_name.split("/")[-1] #eg. "pwd"
-        print(f"\n{'='*70}")
-        print(f"Generating tests for coreutils program: {program_name}")
-        print(f"[{i}/{len(default_progs)}] {program_name}")
-        print('='*70)
-        try:
-            generate_tests_for_one_coreutils_program(program_name)
-            success += 1
-            print(f"✓ {program_name} DONE")
-        except Exception as e:
-            failed += 1
-            print(f"✗ {program_name} FAILED: {e}")
-            continue  # Keep going to next program
+    # dspy settings must be configured from the main thread, before the workers use them
+    initialize_batch_llm()
+    with ThreadPoolExecutor(max_workers=PROGRAM_WORKERS) as executor:
+        futures = {}
+        for i, program_name in enumerate(default_progs, 1):
+            program_name = program_name.split("/")[-1] #eg. "pwd"
+            print(f"\n{'='*70}")
+            print(f"Generating tests for coreutils program: {program_name}")
+            print(f"[{i}/{len(default_progs)}] {program_name}")
+            print('='*70)
+            futures[executor.submit(generate_tests_for_one_coreutils_program, program_name)] = program_name
+        for future in as_completed(futures):
+            program_name = futures[future]
+            try:
+                future.result()
+                success += 1
+                print(f"✓ {program_name} DONE")
+            except Exception as e:
+                failed += 1
+                print(f"✗ {program_name} FAILED: {e}")
+                continue  # Keep going to next program
     print(f"\n{'='*70}")
     print(f"SUMMARY: {success} success, {failed} failed")
     print('='*70)
\ No newline at end of file
@@ -7,44 +7,240 @@ and restore the original source file.
 
 import os
 import subprocess
+import hashlib
 import json
+import multiprocessing.util
+import queue
+from collections import deque
 import shutil
 import tempfile
-from tree_sitter import Language, Parser
-import tree_sitter_c as tsc
-from test_gpt5_generation import remove_main_with_treesitter
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from test_gpt5_generation import CODE_WITHOUT_MAIN_CACHE_KIND, PARSER, remove_main_with_treesitter
+import _ast_cache
+import _podman_api
+
+try:
+    import orjson
+except ImportError:  # optional: only speeds up loading the injectable-function JSON
+    orjson = None
 
 # Configuration
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-CONTAINER_NAME = "build-coreutils"
+# Pristine coreutils checkout that every worker tree is refreshed from
+ORIGINAL_COREUTILS_PATH = os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'coreutils'))
+IMAGE_NAME = "build-coreutils"
+CONTAINER_NAME_PREFIX = "build-coreutils"
+# Lines of make/configure output kept for diagnostics (only the tail is ever printed)
+BUILD_LOG_TAIL_LINES = 64
+# autoconf config.cache files from earlier runs, keyed by configure inputs + flags
+CONFIGURE_CACHE_DIR = os.path.join(SCRIPT_DIR, '.configure-cache')
+CONFIGURE_CACHE_INPUTS = ('configure', 'configure.ac', 'Makefile.am')
+# Mull report scratch files go to the container's own filesystem rather than the bind mount
+MULL_SCRATCH_DIR = "/tmp"
+# Per-function results, one CSV row each (read by mull_threshold.py from the same cwd)
+RESULTS_CSV_PATH = "test_results_mull.txt"
 
 # ---------- container utilities (kept/adjusted from your script) ----------
 
-def start_container(HOST_COREUTILS_PATH):
-    """Start a long-running container in the background (clean start)."""
-    subprocess.run(['podman', 'rm', '-f', CONTAINER_NAME],
+def container_name():
+    """Per-process container name, so parallel workers never share a container."""
+    return f"{CONTAINER_NAME_PREFIX}-{os.getpid()}"
+
+# container name -> host path mounted at /coreutils, for containers this process started
+_container_ready = {}
+
+def container_status(name):
+    """Return the container's state (e.g. 'running'), or '' if it does not exist."""
+    client = _podman_api.client()
+    if client is not None:
+        try:
+            return client.container_status(name)
+        except Exception as e:
+            print(f"⚠ podman API inspect failed ({e}); using the CLI")
+    r = subprocess.run(['podman', 'container', 'inspect', '--format', '{{.State.Status}}', name],
+                       capture_output=True, text=True)
+    return r.stdout.strip() if r.returncode == 0 else ''
+
+def remove_container(name):
+    """Force-remove (stopping if needed) the container, if it exists."""
+    client = _podman_api.client()
+    if client is not None:
+        try:
+            if client.remove_container(name):
+                return
+        except Exception as e:
+            print(f"⚠ podman API remove failed ({e}); using the CLI")
+    subprocess.run(['podman', 'rm', '-f', name],
                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    print(f"Starting container {CONTAINER_NAME}...")
+
+def start_container(HOST_COREUTILS_PATH, name=None):
+    """Start a long-running container in the background (clean start)."""
+    name = name or container_name()
+    if container_status(name):
+        remove_container(name)
+    print(f"Starting container {name}...")
     result = subprocess.run([
-        'podman', 'run', '-d', '--name', CONTAINER_NAME, '--user', 'root',
-        '-v', f'{HOST_COREUTILS_PATH}:/coreutils', 'build-coreutils', 'sleep', 'infinity'
+        'podman', 'run', '-d', '--name', name, '--user', 'root',
+        '-v', f'{HOST_COREUTILS_PATH}:/coreutils', IMAGE_NAME, 'sleep', 'infinity'
     ], capture_output=True, text=True)
     if result.returncode == 0:
+        _container_ready[name] = HOST_COREUTILS_PATH
         print("  ✓ Container started successfully")
         return True
     else:
         print(f"  ✗ Failed to start container: {result.stderr}")
         return False
 
-def run_in_container(command, show_output=False, timeout=120):
-    """Run command in container; returns subprocess.CompletedProcess."""
-    cmd = ['podman', 'exec', '-t', '-w', '/coreutils', CONTAINER_NAME, 'bash', '-c', command]
+def ensure_started(HOST_COREUTILS_PATH, name=None):
+    """
+    Hot-path wrapper around start_container: returns immediately if this process
+    already started the container with the same tree mounted. The container is
+    kept for the rest of the process and torn down at exit.
+    """
+    name = name or container_name()
+    if _container_ready.get(name) == HOST_COREUTILS_PATH:
+        return True
+    if not start_container(HOST_COREUTILS_PATH, name):
+        return False
+    # Finalize (unlike atexit) also runs when a multiprocessing pool worker exits
+    multiprocessing.util.Finalize(None, stop_container, args=(name,), exitpriority=10)
+    return True
 
+class ContainerSession:
+    """
+    One long-lived `podman exec -i ... bash` per container. Commands are written
+    to its stdin and followed by a marker line on both stdout and stderr (the
+    stdout marker carries the exit status), so each command costs a pipe write
+    instead of a fresh podman exec.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.marker = f"__END_{uuid.uuid4().hex}__"
+        self.lock = threading.Lock()
+        self.proc = subprocess.Popen(
+            ['podman', 'exec', '-i', '-w', '/coreutils', name, 'bash'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, encoding='utf-8', errors='replace', bufsize=1)
+        self.stdout_lines = queue.Queue()
+        self.stderr_lines = queue.Queue()
+        for stream, lines in ((self.proc.stdout, self.stdout_lines), (self.proc.stderr, self.stderr_lines)):
+            threading.Thread(target=self._drain, args=(stream, lines), daemon=True).start()
+
+    @staticmethod
+    def _drain(stream, lines):
+        for line in iter(stream.readline, ''):
+            lines.put(line)
+        lines.put(None)  # EOF: the shell (or the container) went away
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def _collect(self, lines, deadline, tail_lines=None):
+        """Gather lines up to this session's marker (only the last tail_lines if set); returns (text, marker_line)."""
+        # one extra slot for the line ended by the newline printed ahead of the marker
+        collected = deque(maxlen=tail_lines + 1) if tail_lines else []
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                line = lines.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(self.proc.args, remaining)
+            if line is None:
+                raise RuntimeError(f"shell session in {self.name} exited")
+            if line.startswith(self.marker):
+                # drop the newline printed ahead of the marker: it is either a line of
+                # its own or the end of an output that had no trailing newline
+                last = collected.pop() if collected else '\n'
+                if last != '\n':
+                    collected.append(last[:-1])
+                if tail_lines and len(collected) > tail_lines:
+                    collected.popleft()
+                return ''.join(collected), line
+            collected.append(line)
+
+    def run(self, command, timeout, tail_lines=None):
+        """Run command in a subshell (stdin from /dev/null); returns (returncode, stdout, stderr)."""
+        with self.lock:
+            deadline = time.monotonic() + timeout
+            self.proc.stdin.write(
+                f"( {command}\n) < /dev/null\n"
+                f"printf '\\n%s %d\\n' {self.marker} $?\n"
+                f"printf '\\n%s\\n' {self.marker} >&2\n")
+            self.proc.stdin.flush()
+            stdout, marker_line = self._collect(self.stdout_lines, deadline, tail_lines)
+            stderr, _ = self._collect(self.stderr_lines, deadline, tail_lines)
+            return int(marker_line.split()[1]), stdout, stderr
+
+    def close(self):
+        if self.alive():
+            try:
+                self.proc.stdin.close()
+                self.proc.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+
+
+_sessions = {}
+
+def get_session(name):
+    """Return the shell session for a container, (re)starting it if needed."""
+    session = _sessions.get(name)
+    if session is None or not session.alive():
+        session = _sessions[name] = ContainerSession(name)
+    return session
+
+def close_session(name):
+    session = _sessions.pop(name, None)
+    if session is not None:
+        session.close()
+
+def exec_once(command, timeout, name, tail_lines=None):
+    """Run command with a one-off `podman exec` (fallback when the shell session is unusable)."""
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        r = subprocess.run(['podman', 'exec', '-w', '/coreutils', name, 'bash', '-c', command],
+                           stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                           encoding='utf-8', errors='replace', timeout=timeout)
     except subprocess.TimeoutExpired:
         print(f"⚠ Command timed out after {timeout}s: {command}")
-        result = subprocess.CompletedProcess(cmd, returncode=1, stdout="", stderr="Timeout expired")
+        return subprocess.CompletedProcess(command, returncode=1, stdout="", stderr="Timeout expired")
+    stdout, stderr = r.stdout, r.stderr
+    if tail_lines:
+        stdout = ''.join(stdout.splitlines(keepends=True)[-tail_lines:])
+        stderr = ''.join(stderr.splitlines(keepends=True)[-tail_lines:])
+    return subprocess.CompletedProcess(command, returncode=r.returncode, stdout=stdout, stderr=stderr)
+
+def run_in_container(command, show_output=False, timeout=120, name=None, tail_lines=None):
+    """
+    Run command in container; returns subprocess.CompletedProcess.
+    With tail_lines set, only the last tail_lines lines of each stream are kept,
+    which bounds memory for verbose commands such as make and configure.
+    """
+    name = name or container_name()
+
+    try:
+        returncode, stdout, stderr = get_session(name).run(command, timeout, tail_lines)
+        result = subprocess.CompletedProcess(command, returncode=returncode, stdout=stdout, stderr=stderr)
+    except subprocess.TimeoutExpired:
+        print(f"⚠ Command timed out after {timeout}s: {command}")
+        # the shell is still busy with the command; start a fresh one next time
+        _sessions.pop(name, None).proc.kill()
+        result = subprocess.CompletedProcess(command, returncode=1, stdout="", stderr="Timeout expired")
+    except (OSError, RuntimeError) as e:
+        print(f"⚠ Shell session failed: {e}")
+        close_session(name)
+        status = container_status(name)
+        if status != 'running':
+            # the container itself is gone; let the next start_container recreate it
+            print(f"⚠ Container {name} is not running (state: {status or 'missing'})")
+            _container_ready.pop(name, None)
+            result = subprocess.CompletedProcess(command, returncode=1, stdout="", stderr=str(e))
+        else:
+            # the container is fine, only the session broke: don't lose this command
+            result = exec_once(command, timeout, name, tail_lines)
     if show_output:
         if result.stdout:
             print(result.stdout)
@@ -52,11 +248,14 @@ def run_in_container(command, show_output=False, timeout=120):
             print(result.stderr)
     return result
 
-def stop_container():
+def stop_container(name=None):
     """Stop and remove the container."""
-    print(f"Stopping container {CONTAINER_NAME}...")
-    subprocess.run(['podman', 'stop', CONTAINER_NAME], capture_output=True)
-    subprocess.run(['podman', 'rm', CONTAINER_NAME], capture_output=True)
+    name = name or container_name()
+    close_session(name)
+    _container_ready.pop(name, None)
+    print(f"Stopping container {name}...")
+    # the container only runs `sleep infinity`, so there is nothing to stop gracefully
+    remove_container(name)
     print("  ✓ Container stopped")
 
 
@@ -65,7 +264,7 @@ def stop_container():
 def clean_build():
     """Run make clean to remove previous build artifacts."""
     print("  Running make clean...")
-    r = run_in_container('make clean', show_output=False, timeout=120)
+    r = run_in_container('make clean', show_output=False, timeout=120, tail_lines=BUILD_LOG_TAIL_LINES)
     if r.returncode == 0:
         print("  ✓ Make clean completed successfully")
         return True
@@ -77,24 +276,52 @@ def clean_build():
             print(f"  stderr: {r.stderr[:500]}")
         return True  # Don't fail on clean errors
 
-def configure_with_mull():
-    """Run configure with Mull instrumentation flags."""
+def configure_cache_path(host_path, configure_cmd):
+    """Where the config.cache for this tree's configure inputs and configure_cmd is kept."""
+    h = hashlib.sha256(configure_cmd.encode('utf-8'))
+    for rel in CONFIGURE_CACHE_INPUTS:
+        path = os.path.join(host_path, rel)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                h.update(f.read())
+    return os.path.join(CONFIGURE_CACHE_DIR, f"{h.hexdigest()}.cache")
+
+def configure_with_mull(host_path=None):
+    """
+    Run configure with Mull instrumentation flags. With --config-cache, the
+    feature-check results of an earlier configure of the same inputs (kept
+    outside host_path, which is refreshed per program) are reused.
+    """
     print("  Configuring with Mull instrumentation...")
     print("  Environment variables:")
     print("    FORCE_UNSAFE_CONFIGURE=1")
-    print("    CC=clang-14")
+    print("    CC=ccache clang-14")
     print("    C_INCLUDE_PATH=/coreutils/lib:/coreutils/unity")
     print("    CFLAGS=-fpass-plugin=/usr/lib/mull-ir-frontend-14 -g -grecord-command-line -fprofile-instr-generate -fcoverage-mapping")
     
     configure_cmd = """
 export FORCE_UNSAFE_CONFIGURE=1
 export CFLAGS="-fpass-plugin=/usr/lib/mull-ir-frontend-14 -g -grecord-command-line -fprofile-instr-generate -fcoverage-mapping"
-CC=clang-14 C_INCLUDE_PATH="/coreutils/lib:/coreutils/unity" ./configure
+CC="ccache clang-14" C_INCLUDE_PATH="/coreutils/lib:/coreutils/unity" ./configure --config-cache
 """
+    host_path = host_path or worker_coreutils_path()
+    tree_cache = os.path.join(host_path, 'config.cache')
+    saved_cache = configure_cache_path(host_path, configure_cmd)
+    if os.path.exists(saved_cache):
+        print(f"  Reusing configure cache {saved_cache}")
+        # a real copy: configure rewrites config.cache, which must not touch the saved one
+        shutil.copyfile(saved_cache, tree_cache)
+
     print("  Running configure command...")
-    r = run_in_container(configure_cmd, show_output=False, timeout=600)
+    r = run_in_container(configure_cmd, show_output=False, timeout=600, tail_lines=BUILD_LOG_TAIL_LINES)
     
     if r.returncode == 0:
+        if os.path.exists(tree_cache):
+            os.makedirs(CONFIGURE_CACHE_DIR, exist_ok=True)
+            # other worker processes may save the same key concurrently
+            tmp = f"{saved_cache}.{os.getpid()}.tmp"
+            shutil.copyfile(tree_cache, tmp)
+            os.replace(tmp, saved_cache)
         print("  ✓ Configure completed successfully")
         print(f"  Configure stdout (last 500 chars):\n{r.stdout[-500:]}")
         return True
@@ -114,10 +341,23 @@ CC=clang-14 C_INCLUDE_PATH="/coreutils/lib:/coreutils/unity" ./configure
 
 # ---------- build / test helpers ----------
 
-def build_program(program_name):
+def make_jobs_flags(jobs=None):
+    """`make` parallelism flags; defaults to every core visible in the container."""
+    if jobs:
+        return f'-j{jobs}'
+    return '-j"$(nproc)" -l"$(nproc)"'
+
+def mull_workers_flag(jobs=None):
+    """mull-runner parallelism flag, sharing cores the same way as make_jobs_flags."""
+    if jobs:
+        return f'--workers={jobs}'
+    return '--workers="$(nproc)"'
+
+def build_program(program_name, jobs=None, name=None):
     """Build a single program inside container (make src/<program_name>)."""
     print(f"  Building src/{program_name}...")
-    r = run_in_container(f'make src/{program_name}', show_output=False, timeout=300)
+    r = run_in_container(f'make {make_jobs_flags(jobs)} src/{program_name}', show_output=False, timeout=300,
+                         name=name, tail_lines=BUILD_LOG_TAIL_LINES)
     if r.returncode == 0:
         print(f"  ✓ Built src/{program_name}")
         return True, r.stdout
@@ -134,10 +374,10 @@ def build_program(program_name):
         print("  " + "="*50)
         return False, r.stderr
 
-def run_tests(program_name):
+def run_tests(program_name, name=None):
     """Run the compiled program inside container and capture output."""
     print(f"  Running tests: ./src/{program_name}")
-    r = run_in_container(f'./src/{program_name}', show_output=False, timeout=120)
+    r = run_in_container(f'./src/{program_name}', show_output=False, timeout=120, name=name)
     # Consider "FAIL" in stdout as a failing test; otherwise returncode 0 is success.
     passed = (r.returncode == 0) and ("FAIL" not in (r.stdout or ""))
     if passed:
@@ -186,48 +426,72 @@ def avg(values):
     return average
 
 
-def run_mull(program_name, function_name):
-    """Run Mull mutation testing and save output to file."""
+# Lines extract_mutation_metrics_from_output looks at; every pattern it uses is single-line
+MULL_METRIC_LINE = re.compile(r"No mutants found|All mutations have been killed|Finished|Mutation score:|Survived mutants \(")
+
+def read_mull_report(path, preview_lines=30):
+    """
+    Stream a Mull report, keeping only what is needed: (line count, first
+    preview_lines lines, text of the lines the metrics are parsed from).
+    """
+    line_count = 0
+    preview = []
+    metric_lines = []
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line_count += 1
+            if line_count <= preview_lines:
+                preview.append(line.rstrip('\n'))
+            if MULL_METRIC_LINE.search(line):
+                metric_lines.append(line)
+    return line_count, preview, ''.join(metric_lines)
+
+def run_mull(program_name, function_name, name=None, host_path=None, jobs=None):
+    """Run Mull mutation testing (mutants evaluated on jobs threads) and save output to file."""
     reports_dir = "mull-reports"
-    mkdir_cmd = f"mkdir -p {reports_dir}"
-    run_in_container(mkdir_cmd, show_output=False)
-    
+    host_path = host_path or worker_coreutils_path()
+
     # Save output to mull-reports directory
     output_file = f"{reports_dir}/mull_{program_name}_{function_name}.out"
     print(f"  Running Mull mutation testing...")
-    print(f"  Command: mull-runner-14 src/{program_name} --debug")
+    print(f"  Command: mull-runner-14 {mull_workers_flag(jobs)} src/{program_name} --debug")
     print(f"  Output will be saved to: {output_file}")
     
-    mull_cmd = f'mull-runner-14 src/{program_name} --debug > {output_file} 2>&1'
-    r = run_in_container(mull_cmd, show_output=False, timeout=600)
+    # Mull's many small --debug writes go to the container's own /tmp; the finished
+    # report is copied to the bind-mounted tree in one go and read from the host side
+    # below, so none of it travels back through the container session. Surviving
+    # mutants also make mull-runner exit non-zero, so only a runner that could not
+    # be started at all (126/127) leaves no report behind; a runner killed by a
+    # signal (128+N) keeps its partial report for diagnosis.
+    # The previous run's report is removed first, so a run that times out or never
+    # starts cannot be scored from it; the scratch file is per function, so a runner
+    # left behind by a timeout does not share it with the next function's run.
+    scratch_output = f"{MULL_SCRATCH_DIR}/mull_{program_name}_{function_name}.out"
+    mull_cmd = (f'rm -f {output_file}; '
+                f'mull-runner-14 {mull_workers_flag(jobs)} src/{program_name} --debug > {scratch_output} 2>&1; rc=$?; '
+                f'case $rc in 126|127) ;; *) mkdir -p {reports_dir} && cp {scratch_output} {output_file} ;; esac; '
+                f'rm -f {scratch_output}; exit $rc')
+    r = run_in_container(mull_cmd, show_output=False, timeout=600, name=name)
     
     print(f"  Mull command return code: {r.returncode}")
-    cat_result = run_in_container(f'cat {output_file}')
-    if cat_result.returncode == 0:
-        output_text = cat_result.stdout
+    host_output_file = os.path.join(host_path, output_file)
+    if os.path.isfile(host_output_file):
+        line_count, preview, metrics_text = read_mull_report(host_output_file)
+        score, killed, survived, total = extract_mutation_metrics_from_output(metrics_text)
 
-    score, killed, survived, total = extract_mutation_metrics_from_output(output_text)
-
-    # Check if output file was created and has content
-    check_cmd = f'[ -f {output_file} ] && wc -l {output_file}'
-    check_result = run_in_container(check_cmd, show_output=False)
-    
-    if check_result.returncode == 0:
         print(f"  ✓ Mull completed, output saved to {output_file}")
-        print(f"    {check_result.stdout.strip()}")
+        print(f"    {line_count} {output_file}")
         
         # Show a preview of the output
-        preview_cmd = f'head -30 {output_file}'
-        preview_result = run_in_container(preview_cmd, show_output=False)
-        if preview_result.returncode == 0:
-            print(f"  Preview of {output_file}:")
-            print("  " + "-"*50)
-            for line in preview_result.stdout.split('\n')[:30]:
-                print(f"  {line}")
-            print("  " + "-"*50)
+        print(f"  Preview of {output_file}:")
+        print("  " + "-"*50)
+        for line in preview:
+            print(f"  {line}")
+        print("  " + "-"*50)
         
         return score,killed,survived,total, output_file
     else:
+        score, killed, survived, total = extract_mutation_metrics_from_output("")
         print(f"  ✗ Mull execution may have failed")
         print(f"  Check output stdout: {r.stdout[:500] if r.stdout else '(empty)'}")
         print(f"  Check output stderr: {r.stderr[:500] if r.stderr else '(empty)'}")
@@ -248,63 +512,149 @@ def copy_results_back(temp_coreutils_path, original_coreutils_path):
         os.makedirs(mull_reports_dest, exist_ok=True)
         
         # Copy each file individually (preserves other files, overwrites duplicates)
-        for item in os.listdir(mull_reports_src):
-            src_item = os.path.join(mull_reports_src, item)
-            dest_item = os.path.join(mull_reports_dest, item)
-            
-            if os.path.isfile(src_item):
-                shutil.copy2(src_item, dest_item)
-                print(f"  ✓ Copied {item}")
-            elif os.path.isdir(src_item):
-                # For subdirectories, remove and replace
-                if os.path.exists(dest_item):
-                    shutil.rmtree(dest_item)
-                shutil.copytree(src_item, dest_item)
-                print(f"  ✓ Copied directory {item}")
+        with os.scandir(mull_reports_src) as entries:
+            for entry in entries:
+                dest_item = os.path.join(mull_reports_dest, entry.name)
+
+                if entry.is_file():
+                    shutil.copy2(entry.path, dest_item)
+                    print(f"  ✓ Copied {entry.name}")
+                elif entry.is_dir():
+                    # For subdirectories, remove and replace
+                    if os.path.exists(dest_item):
+                        shutil.rmtree(dest_item)
+                    shutil.copytree(entry.path, dest_item)
+                    print(f"  ✓ Copied directory {entry.name}")
         
         print(f"  ✓ Merged results into mull-reports/")
     else:
         print("  No mull-reports directory found")
         
-def append_include_line_to_code(code_without_main, include_line):
-    """Return new code string with include_line appended if absent."""
-    lines = code_without_main.splitlines()
-    if include_line in lines:
-        return '\n'.join(lines) + '\n'  # unchanged (but normalized newline)
-    lines.append(include_line)
-    return '\n'.join(lines) + '\n'
-
-def write_host_file(path, content):
-    """Write content to host path atomically using temp file."""
+def prepare_base_code(code_without_main):
+    """
+    Return (code ending in a newline, frozenset of its lines), computed once per
+    program and shared by every append_include_line_to_code call.
+    """
+    base_code = code_without_main if code_without_main.endswith('\n') else code_without_main + '\n'
+    return base_code, frozenset(code_without_main.splitlines())
+
+def append_include_line_to_code(base, include_line):
+    """Return new code string with include_line appended if absent. base comes from prepare_base_code."""
+    base_code, base_lines = base
+    if include_line in base_lines:
+        return base_code  # unchanged (but normalized newline)
+    return base_code + include_line + '\n'
+
+def write_host_file(path, content, atomic=True):
+    """
+    Write content to host path, atomically using temp file unless atomic=False
+    (for transient working copies that nothing reads concurrently).
+    """
     dirpath = os.path.dirname(path)
     os.makedirs(dirpath, exist_ok=True)
-    fd, tmp = tempfile.mkstemp(dir=dirpath, prefix='.tmp_write_')
-    os.close(fd)
+    if not atomic:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return
+    # each path is only written by its own worker, so a fixed sibling name is safe
+    tmp = path + '.tmp'
     with open(tmp, 'w', encoding='utf-8') as f:
         f.write(content)
-    # atomic move
-    shutil.move(tmp, path)
+    # atomic rename (same directory, so never a cross-device copy)
+    os.replace(tmp, path)
 
 
 # ---------- main inject-and-test logic ----------
 
-def inject_and_test(program_name, HOST_COREUTILS_PATH, INJECTABLE_FUNCTION_PATH, run_mutation_testing=True):
+def process_function(program_name, function_name, include_line, base,
+                     worker, run_mutation_testing=True, jobs=None):
+    """
+    Inject one function's test include into the worker's copy of src/<program>.c,
+    build and run tests (and Mull). The file is left modified: the next function
+    overwrites it, and inject_and_test restores it once at the end. base is the
+    prepare_base_code result for the source without main(); worker is a
+    (host coreutils path, container name) pair owned by the caller for the duration.
+    """
+    host_path, name = worker
+    src_c_path = os.path.join(host_path, 'src', f"{program_name}.c")
+
+    print("\n" + "-"*60)
+    print(f"Processing function: {function_name} (container {name})")
+    # create modified code by appending include
+    modified_code = append_include_line_to_code(base, include_line)
+
+    # write modified code back to host file (visible inside container); it is only
+    # read by the make below, so skip the temp file + rename
+    write_host_file(src_c_path, modified_code, atomic=False)
+    print(f"  Wrote modified {src_c_path} (include: {include_line})")
+
+    # build and run
+    built, build_output = build_program(program_name, jobs=jobs, name=name)
+
+    result_entry = {
+        "function": function_name,
+        "build": built,
+        "test": False,
+        "mull_score": None,
+        "mull_total": 0,
+        "mull_killed": 0,
+        "mull_survived": 0,
+        "mull_output": None,
+        "stdout": "",
+        "stderr": "",
+        "build_output": build_output or ""
+    }
+
+    if not built:
+        return result_entry
+
+
+    passed, stdout, stderr = run_tests(program_name, name=name)
+    result_entry["test"] = passed
+    result_entry["stdout"] = stdout or ""
+    result_entry["stderr"] = stderr or ""
+
+    # run Mull if enabled and tests passed
+    if passed and run_mutation_testing:
+        print(f"  Function {function_name} passed tests. Running mutation testing...")
+        mull_score, mull_killed, mull_survived, mull_total, mull_output_file = run_mull(program_name, function_name, name=name,
+                                                                                        host_path=host_path, jobs=jobs)
+        result_entry.update({
+            "mull_score": mull_score if mull_score != "N/A" else None,
+            "mull_total": mull_total,
+            "mull_killed": mull_killed,
+            "mull_survived": mull_survived,
+            "mull_output": mull_output_file
+        })
+
+    if passed:
+        print(f"  ✓ Function {function_name} passed tests after injection.")
+    return result_entry
+
+
+def inject_and_test(program_name, HOST_COREUTILS_PATH, INJECTABLE_FUNCTION_PATH, run_mutation_testing=True, jobs=None,
+                    num_workers=None, parser=PARSER):
     """
     For each injectable function (JSON at injectable_functions/<program>_injectable_functions.json),
     append that function's include to src/<program>/<program>.c, build, run tests, and restore original file.
     If run_mutation_testing is True, also run Mull after successful tests.
-    """
-    C_LANGUAGE = Language(tsc.language())
-    parser = Parser(C_LANGUAGE)
 
+    Functions are spread over num_workers containers (default: one per core, at most
+    one per function). Worker 0 is HOST_COREUTILS_PATH itself; the others get a copy
+    of it, so it must already be configured.
+    """
     injectable_json = os.path.join(INJECTABLE_FUNCTION_PATH, f"{program_name}_injectable_functions.json")
     if not os.path.exists(injectable_json):
         print(f"No injectable JSON found: {injectable_json}")
         return
 
     # load injectable functions
-    with open(injectable_json, 'r', encoding='utf-8') as f:
-        injectable_functions = json.load(f)
+    if orjson is not None:
+        with open(injectable_json, 'rb') as f:
+            injectable_functions = orjson.loads(f.read())
+    else:
+        with open(injectable_json, 'r', encoding='utf-8') as f:
+            injectable_functions = json.load(f)
 
     src_c_path = os.path.join(HOST_COREUTILS_PATH, 'src', f"{program_name}.c")
     if not os.path.exists(src_c_path):
@@ -312,83 +662,76 @@ def inject_and_test(program_name, HOST_COREUTILS_PATH, INJECTABLE_FUNCTION_PATH,
         return
 
     # backup original
-    with open(src_c_path, 'r', encoding='utf-8') as f:
-        original_code = f.read()
-    original_code_without_main = remove_main_with_treesitter(src_c_path, parser).decode('utf-8')
-    results = []
+    with open(src_c_path, 'rb') as f:
+        original_source = f.read()
+    original_code = original_source.decode('utf-8')
+
+    # main() removal only depends on the file's content, so reuse earlier runs' result
+    cache_key = _ast_cache.content_key(CODE_WITHOUT_MAIN_CACHE_KIND, original_source)
+    code_without_main = _ast_cache.get(cache_key)
+    if code_without_main is None:
+        code_without_main = remove_main_with_treesitter(original_source, parser.parse(original_source))
+        _ast_cache.put(cache_key, code_without_main)
+    base = prepare_base_code(code_without_main.decode('utf-8'))
+
+    # normalize once into (name, include_line) tuples; entries without an include are skipped
+    funcs = [(func.get("function_name") or func.get("name") or "<unknown>", func.get("include_line"))
+             for func in injectable_functions]
+    for function_name, include_line in funcs:
+        if not include_line:
+            print(f"Skipping {function_name}: no include_line")
+    funcs = [func for func in funcs if func[1]]
+    if not funcs:
+        # nothing to inject: skip the pre-build and the extra workers entirely
+        print(f"No injectable functions for {program_name}")
+        return []
+
+    # Build the unmodified program once with every core: this compiles the
+    # shared objects (lib/, libver, unity) it links against, so each
+    # per-function make below only recompiles src/<program>.c and relinks,
+    # and the extra workers start from a tree that already has them
+    print("Pre-building shared dependencies...")
+    build_program(program_name, jobs=jobs)
+
+    num_workers = max(1, min(num_workers or os.cpu_count() or 1, len(funcs)))
+    if jobs is None and num_workers > 1:
+        # share the cores between the workers' builds
+        jobs = max(1, (os.cpu_count() or 1) // num_workers)
+
+    workers = [(HOST_COREUTILS_PATH, container_name())]
+    for worker_id in range(1, num_workers):
+        worker = worker_slot(worker_id)
+        print(f"Preparing worker {worker_id}: {worker[0]}")
+        refresh_tree(HOST_COREUTILS_PATH, worker[0])
+        if not ensure_started(*worker):
+            raise SystemExit(f"Failed to start container {worker[1]}")
+        workers.append(worker)
+
+    idle_workers = queue.Queue()
+    for worker in workers:
+        idle_workers.put(worker)
+
+    def run_on_idle_worker(function_name, include_line):
+        worker = idle_workers.get()
+        try:
+            return process_function(program_name, function_name, include_line, base,
+                                    worker, run_mutation_testing, jobs)
+        finally:
+            idle_workers.put(worker)
 
     try:
-        for func in injectable_functions:
-            function_name = func.get("function_name") or func.get("name") or "<unknown>"
-            include_line = func.get("include_line")
-            if not include_line:
-                print(f"Skipping {function_name}: no include_line")
-                continue
-
-            print("\n" + "-"*60)
-            print(f"Processing function: {function_name}")
-            # create modified code by appending include
-            modified_code = append_include_line_to_code(original_code_without_main, include_line)
-
-            # write modified code back to host file (visible inside container)
-            write_host_file(src_c_path, modified_code)
-            print(f"  Wrote modified {src_c_path} (include: {include_line})")
-
-            # build and run
-            built, build_output = build_program(program_name)
-
-            result_entry = {
-                "function": function_name,
-                "build": built,
-                "test": False,
-                "mull_score": None,
-                "mull_total": 0,
-                "mull_killed": 0,
-                "mull_survived": 0,
-                "mull_output": None,
-                "stdout": "",
-                "stderr": "",
-                "build_output": build_output or ""
-            }
-
-            if not built:
-                # restore original and continue
-                write_host_file(src_c_path, original_code)
-                print("  Restored code after failed build.")
-                results.append(result_entry)
-                continue
-
-
-            passed, stdout, stderr = run_tests(program_name)
-            result_entry["test"] = passed
-            result_entry["stdout"] = stdout or ""
-            result_entry["stderr"] = stderr or ""
-            
-            # run Mull if enabled and tests passed
-            if passed and run_mutation_testing:
-                print(f"  Function {function_name} passed tests. Running mutation testing...")
-                mull_score, mull_killed, mull_survived, mull_total, mull_output_file = run_mull(program_name, function_name)
-                result_entry.update({
-                    "mull_score": mull_score if mull_score != "N/A" else None,
-                    "mull_total": mull_total,
-                    "mull_killed": mull_killed,
-                    "mull_survived": mull_survived,
-                    "mull_output": mull_output_file
-                })
-
-            results.append(result_entry)
-
-            if passed:
-                print(f"  ✓ Function {function_name} passed tests after injection.")
-            
-            # restore original file (so next iteration starts from clean source)
-            write_host_file(src_c_path, original_code)
-            print("  Restored original source file after test run.")
-
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = [executor.submit(run_on_idle_worker, *func) for func in funcs]
+            results = [future.result() for future in futures]
     finally:
-        # ensure source restored even if exception occurs
-        if os.path.exists(src_c_path):
-            write_host_file(src_c_path, original_code)
+        for host_path, _ in workers:
+            # restore the original source (also if an exception occurred)
+            worker_src_c_path = os.path.join(host_path, 'src', f"{program_name}.c")
+            if os.path.exists(worker_src_c_path):
+                write_host_file(worker_src_c_path, original_code)
+        # gather the other workers' Mull reports into the main tree
+        for host_path, _ in workers[1:]:
+            copy_results_back(host_path, HOST_COREUTILS_PATH)
 
     # Print summary
     print("\n" + "="*40)
@@ -400,23 +743,85 @@ def inject_and_test(program_name, HOST_COREUTILS_PATH, INJECTABLE_FUNCTION_PATH,
     return results
 
 
-def run_build_execute_mutate_for_one_coreutils_program(program_name, enable_mutation_testing):
-    original_coreutils_path = os.path.join(SCRIPT_DIR, '..', 'coreutils')
-    original_coreutils_path = os.path.abspath(original_coreutils_path)
+_worker_root = None
 
-    # Create a temporary copy of coreutils
-    temp_dir = tempfile.mkdtemp(prefix='coreutils_tmp_')
-    HOST_COREUTILS_PATH = os.path.join(temp_dir, 'coreutils')
+def worker_coreutils_path():
+    """
+    Scratch copy of coreutils for this process. It lives at a fixed path for the
+    life of the process so the container's bind mount stays valid across programs.
+    """
+    global _worker_root
+    if _worker_root is None:
+        # next to the original tree, so refresh_tree's reflink copies stay on one filesystem
+        _worker_root = tempfile.mkdtemp(prefix='.coreutils_tmp_', dir=os.path.dirname(ORIGINAL_COREUTILS_PATH))
+        multiprocessing.util.Finalize(None, remove_worker_root, exitpriority=0)
+    return os.path.join(_worker_root, 'coreutils')
+
+def worker_slot(worker_id):
+    """(host coreutils path, container name) of this process's function-level worker worker_id."""
+    if worker_id == 0:
+        return worker_coreutils_path(), container_name()
+    host_path = os.path.join(os.path.dirname(worker_coreutils_path()), f'worker-{worker_id}', 'coreutils')
+    return host_path, f"{container_name()}-w{worker_id}"
+
+def remove_worker_root():
+    print(f"Removing temporary directory: {_worker_root}")
+    shutil.rmtree(_worker_root, ignore_errors=True)
+    print("  ✓ Cleanup complete")
+
+def refresh_tree(src, dst):
+    """
+    Make dst a fresh copy of src without replacing dst itself (it may be bind-mounted).
+    Files are copied with `cp --reflink=auto`: on copy-on-write filesystems (btrfs,
+    XFS) the copy shares src's data blocks until written, elsewhere it is a plain
+    copy. Hardlinks are not an option: Mull's report cp and configure's
+    config.status/config.log write into existing files, which would reach src.
+    """
+    if os.path.isdir(dst):
+        with os.scandir(dst) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+    os.makedirs(dst, exist_ok=True)
+    # one cp for the whole tree (symlinks and modes preserved, like copytree + copy2)
+    subprocess.run(['cp', '-a', '--reflink=auto', os.path.join(src, '.'), dst], check=True)
+
+
+def append_results_csv(program_name, results, file_path=RESULTS_CSV_PATH):
+    """Append one program's per-function results to the results CSV, writing the header for a new file."""
+    header_needed = not os.path.exists(file_path)
+    with open(file_path, "a") as f:
+        if header_needed:
+            f.write("program_name,function_name,build,test,mull_score,mull_total,mull_killed,mull_survived\n")
+        for r in results:
+            f.write(
+                f"{program_name},{r['function']},{r['build']},{r['test']},"
+                f"{r['mull_score'] if r['mull_score'] is not None else 'N/A'},"
+                f"{r['mull_total']},{r['mull_killed']},{r['mull_survived']}\n"
+            )
+
+
+def run_build_execute_mutate_for_one_coreutils_program(program_name, enable_mutation_testing, jobs=None, num_workers=None,
+                                                       write_results=True):
+    """
+    Build, test and mutate every injectable function of program_name and return
+    the per-function results. They are appended to the results CSV unless
+    write_results is False (parallel callers write them from a single process).
+    """
+    # Refresh this worker's copy of coreutils (reused across programs)
+    HOST_COREUTILS_PATH = worker_coreutils_path()
 
-    print(f"Creating temporary copy: {HOST_COREUTILS_PATH}")
-    shutil.copytree(original_coreutils_path, HOST_COREUTILS_PATH, symlinks=True)
+    print(f"Refreshing temporary copy: {HOST_COREUTILS_PATH}")
+    refresh_tree(ORIGINAL_COREUTILS_PATH, HOST_COREUTILS_PATH)
 
     # Compute injectable path from temp copy
     INJECTABLE_FUNCTION_PATH = os.path.join(HOST_COREUTILS_PATH, 'injectable_functions')
     
 
     try:
-        if not start_container(HOST_COREUTILS_PATH):
+        if not ensure_started(HOST_COREUTILS_PATH):
             raise SystemExit("Failed to start container")
 
         # Configure with Mull instrumentation
@@ -430,25 +835,17 @@ def run_build_execute_mutate_for_one_coreutils_program(program_name, enable_muta
             print("\n" + "="*60)
             print("STEP 2: Configure with Mull")
             print("="*60)
-            if not configure_with_mull():
+            if not configure_with_mull(HOST_COREUTILS_PATH):
                 raise SystemExit("Failed to configure with Mull")
         
         print("\n" + "="*60)
         print("STEP 3: Inject tests and build")
         print("="*60)
-        results = inject_and_test(program_name, HOST_COREUTILS_PATH, INJECTABLE_FUNCTION_PATH, run_mutation_testing=enable_mutation_testing)
-
-        file_path = "test_results_mull.txt"
-        header_needed = not os.path.exists(file_path)
-        with open(file_path, "a") as f:
-            if header_needed:
-                f.write("program_name,function_name,build,test,mull_score,mull_total,mull_killed,mull_survived\n")
-            for r in results:
-                f.write(
-                    f"{program_name},{r['function']},{r['build']},{r['test']},"
-                    f"{r['mull_score'] if r['mull_score'] is not None else 'N/A'},"
-                    f"{r['mull_total']},{r['mull_killed']},{r['mull_survived']}\n"
-                )
+        results = inject_and_test(program_name, HOST_COREUTILS_PATH, INJECTABLE_FUNCTION_PATH, run_mutation_testing=enable_mutation_testing, jobs=jobs,
+                                  num_workers=num_workers)
+
+        if write_results:
+            append_results_csv(program_name, results)
 
         # # Count build and test successes/failures
         # total = len(results)
@@ -477,13 +874,11 @@ def run_build_execute_mutate_for_one_coreutils_program(program_name, enable_muta
         #     f.write(f"{program_name},{total},{build_success},{test_success},{mull_score},{mull_total}\n")
 
     finally:
-        stop_container()
-        # Copy results back to original coreutils directory
-        copy_results_back(HOST_COREUTILS_PATH, original_coreutils_path)
-        # Clean up temp directory
-        print(f"Removing temporary directory: {temp_dir}")
-        shutil.rmtree(temp_dir, ignore_errors=True)
-        print("  ✓ Cleanup complete")
+        # Copy results back to original coreutils directory; the container and
+        # the temporary tree are kept for this worker's next program
+        copy_results_back(HOST_COREUTILS_PATH, ORIGINAL_COREUTILS_PATH)
+
+    return results
 
 if __name__ == "__main__":
     program_name = "pwd"  # change as needed
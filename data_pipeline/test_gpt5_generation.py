@@ -1,89 +1,162 @@
 import dspy
+import hashlib
 import os
-from tree_sitter import Language, Parser
+from tree_sitter import Language, Parser, Query, QueryCursor
 import tree_sitter_c as tsc
 import re
+import threading
 from pathlib import Path
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import _ast_cache
+
+try:
+    import orjson
+except ImportError:  # optional: only speeds up writing the injectable-function JSON
+    orjson = None
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-HOST_COREUTILS_PATH = os.path.join(SCRIPT_DIR, '..', 'coreutils')
-HOST_COREUTILS_PATH = os.path.abspath(HOST_COREUTILS_PATH)
+HOST_COREUTILS_PATH = os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'coreutils'))
 INJECTABLE_FUNCTION_PATH = os.path.join(HOST_COREUTILS_PATH, 'injectable_functions')
+# Concurrent LLM requests per program; calls are independent and network-bound
+LLM_WORKERS = 8
+# Functions per request: the program code is sent once per batch instead of once per
+# function. Kept small so every test file fits in gpt-5's max_tokens; 1 disables batching.
+LLM_BATCH_SIZE = 4
+# Threads writing generated test files, so the loop collecting LLM results never waits on disk
+TEST_WRITER_WORKERS = 4
+# dspy's on-disk response cache (on by default in dspy.LM): reruns with the same
+# prompt skip the API call. Set LLM_CACHE=0 to always query the model (e.g. to
+# sample fresh tests).
+LLM_CACHE = os.environ.get("LLM_CACHE", "1") != "0"
+
+# Markdown code blocks in an LLM answer: the first ```c block is preferred over the first
+# bare ``` one; the newline after the fence is optional and an unterminated block runs to the end
+C_FENCE = re.compile(r"```c\s*(.*?)(?:```|\Z)", re.S)
+FENCE = re.compile(r"```\s*(.*?)(?:```|\Z)", re.S)
+
+# Maps every ASCII character that is not [0-9a-zA-Z_] to '_' (for test file names)
+IDENTIFIER_CLEAN_TABLE = str.maketrans({c: '_' for c in map(chr, range(128))
+                                        if not (c.isalnum() or c == '_')})
+
+# Functions with fewer non-empty lines than this are not worth generating tests for
+MIN_FUNCTION_LINES = 10
+
+# tree-sitter objects are reusable across parses; build them once per process
+C_LANGUAGE = Language(tsc.language())
+PARSER = Parser(C_LANGUAGE)
+# Function definitions whose declarator is a plain `name(...)`, matched in C by
+# tree-sitter instead of walking every node from Python
+FUNCTION_QUERY = Query(C_LANGUAGE, """
+(function_definition
+  declarator: (function_declarator declarator: (identifier) @name)) @function
+""")
+MAIN_QUERY = Query(C_LANGUAGE, """
+(function_definition
+  declarator: (function_declarator declarator: (identifier) @name (#eq? @name "main"))) @function
+""")
+# _ast_cache kind of a program's source with main() removed (shared with
+# test_container_one_mull); bump the version when the extraction changes
+CODE_WITHOUT_MAIN_CACHE_KIND = 'code_without_main_v2'
 
 
-def get_function_info(c_file, parser):
+def function_matches(query, root_node):
+    """Run one of the function queries over a tree; matches come back in source order."""
+    # No depth limit: definitions can sit under any number of nested #if/#elif/#else
+    # blocks, and the whole match already runs in tree-sitter's C code
+    return QueryCursor(query).matches(root_node)
+
+
+def load_program(c_file, parser):
+    """
+    Return (source without main() as bytes, get_function_info list) for a C file.
+    Both only depend on the file's content and are cached under its hash, so an
+    unchanged file is not parsed at all; otherwise it is read and parsed once.
+    """
+    source_code = Path(c_file).read_bytes()
+
+    main_key = _ast_cache.content_key(CODE_WITHOUT_MAIN_CACHE_KIND, source_code)
+    # bump the version when the extracted fields change, so stale entries are not reused
+    info_key = _ast_cache.content_key(f'function_info_v3_min{MIN_FUNCTION_LINES}', source_code)
+    code_without_main = _ast_cache.get(main_key)
+    function_info = _ast_cache.get(info_key)
+    if code_without_main is not None and function_info is not None:
+        return code_without_main, json.loads(function_info)
+
+    tree = parser.parse(source_code)
+    code_without_main = remove_main_with_treesitter(source_code, tree)
+    function_info = get_function_info(source_code, tree)
+    _ast_cache.put(main_key, code_without_main)
+    _ast_cache.put(info_key, json.dumps(function_info).encode('utf-8'))
+    return code_without_main, function_info
+
+
+def get_function_info(c_code, tree):
     """
     Extract detailed information about all functions (except main).
     
     Args:
-        c_file: Path to the C source file
-        parser: tree-sitter Parser instance
+        c_code: C source bytes
+        tree: tree-sitter Tree parsed from c_code
     
     Returns:
         List of dicts with keys: 'name', 'start_byte', 'end_byte', 'code', 'signature'
     """
-    # Parse the code
-    with open(c_file, 'rb') as f:
-        c_code = f.read()
-    tree = parser.parse(c_code)
-    
     functions = []
+
+    # Decode once. Byte offsets are character offsets in pure-ASCII source (nearly all
+    # of coreutils), so slices come straight from the str; otherwise decode each slice.
+    if c_code.isascii():
+        c_text = c_code.decode('ascii')
+        def text(start_byte, end_byte):
+            return c_text[start_byte:end_byte]
+    else:
+        def text(start_byte, end_byte):
+            return c_code[start_byte:end_byte].decode('utf-8')
     
     def get_function_signature(func_def_node):
-        """Extract the function signature (return type + declarator)"""
-        signature_parts = []
-        
-        for child in func_def_node.children:
-            # Get everything before the compound_statement (function body)
-            if child.type == 'compound_statement':
-                break
-            signature_parts.append(c_code[child.start_byte:child.end_byte])
-        
-        return b' '.join(signature_parts).decode('utf-8').strip()
+        """Extract the function signature (return type + declarator) on one line"""
+        # Everything before the compound_statement (function body) is one contiguous span
+        body = func_def_node.child_by_field_name('body')
+        end_byte = body.start_byte if body is not None else func_def_node.end_byte
+        # collapse line breaks/indentation (e.g. GNU style's return type on its own line)
+        return ' '.join(text(func_def_node.start_byte, end_byte).split())
     
-    def filter_trivial_function(func_code, min_lines):
+    def filter_trivial_function(func_node, func_code, min_lines):
         """Return True if function has fewer than min_lines of code"""
+        # The rows the node spans bound its line count: most small functions are
+        # rejected here without looking at the text
+        if func_node.end_point[0] - func_node.start_point[0] + 1 < min_lines:
+            return True
         # Count non-empty lines
-        lines = [line for line in func_code.splitlines() if line.strip()]
-        return len(lines) < min_lines
-        
-    def traverse_tree(node):
-        """Recursively traverse to find function definitions"""
-        if node.type == 'function_definition':
-            # Extract function name
-            func_name = None
-            for child in node.children:
-                if child.type == 'function_declarator':
-                    for subchild in child.children:
-                        if subchild.type == 'identifier':
-                            func_name = c_code[subchild.start_byte:subchild.end_byte].decode('utf-8')
-                            break
-                    break
-            
-            # Skip main function
-            if func_name and func_name != 'main':
-                func_code = c_code[node.start_byte:node.end_byte].decode('utf-8')
-                
-                # Skip functions that are too small
-                if filter_trivial_function(func_code, 10):
-                    return
-                
-                signature = get_function_signature(node)
-                
-                functions.append({
-                    'name': func_name,
-                    'start_byte': node.start_byte,
-                    'end_byte': node.end_byte,
-                    'code': func_code,
-                    'signature': signature
-                })
+        return sum(1 for line in func_code.splitlines() if line.strip()) < min_lines
         
-        # Recursively traverse children
-        for child in node.children:
-            traverse_tree(child)
-    
-    traverse_tree(tree.root_node)
+    # Matches come back in source order
+    for _, captures in function_matches(FUNCTION_QUERY, tree.root_node):
+        node = captures['function'][0]
+        name_node = captures['name'][0]
+        func_name = text(name_node.start_byte, name_node.end_byte)
+
+        # Skip main function
+        if func_name == 'main':
+            continue
+
+        func_code = text(node.start_byte, node.end_byte)
+
+        # Skip functions that are too small
+        if filter_trivial_function(node, func_code, MIN_FUNCTION_LINES):
+            continue
+
+        signature = get_function_signature(node)
+
+        functions.append({
+            'name': func_name,
+            'start_byte': node.start_byte,
+            'end_byte': node.end_byte,
+            'code': func_code,
+            'signature': signature
+        })
+
     return functions
 
 class FunctionToUnityTests(dspy.Signature):
@@ -93,7 +166,7 @@ class FunctionToUnityTests(dspy.Signature):
 
     CONTEXT:
     - The original main() function has been removed from the coreutils program source.
-    - Your tests_for_{function_name}.c file has been directly included into the program source (e.g., via #include "../tests/tests_for_{function_name}.c").
+    - Your tests_for_{function_name}.c file has been directly included at the end of the program source, via the line given in test_include_line (e.g., #include "../tests/tests_for_{function_name}.c").
     - All internal functions from the program are accessible.
     - Ensure the test file does not break compilation: do not redefine or redeclare any global symbols, macros, constants, or inline helpers from the original program or its headers.
 
@@ -116,28 +189,68 @@ class FunctionToUnityTests(dspy.Signature):
     - Define main() that calls UNITY_BEGIN(), RUN_TEST() for each test, and returns UNITY_END().
     - CRITICAL RULES FOR STDOUT/STDERR REDIRECTION: Unity's TEST_ASSERT macros write to stdout. If your test redirects stdout (common for I/O testing), Do NOT use TEST_ASSERT macros while stdout is redirected. Use simple if-checks with return NULL for errors. Only use TEST_ASSERT before redirection or after restoration.
     """
+    # Field order is prompt order: keep the per-program fields first (program_code is
+    # byte-identical for all of a program's functions) and the per-function fields last,
+    # so every request for a program shares the longest cacheable prefix
     program_name : str = dspy.InputField(description="The coreutils program name (e.g., 'cat')")
     program_code: str = dspy.InputField(description="The full coreutils program code")
+    test_include_line: str = dspy.InputField(description="The line appended to program_code that includes the test file")
     target_function_name: str = dspy.InputField(description="Name of the specific function to test")
     tests_c: str = dspy.OutputField(description="Complete Unity test file that thoroughly tests ONLY the target function")
 
+class BatchFunctionToUnityTests(dspy.Signature):
+    """Write one Unity test file per target function; instructions are set below from FunctionToUnityTests."""
+    program_name : str = dspy.InputField(description="The coreutils program name (e.g., 'cat')")
+    program_code: str = dspy.InputField(description="The full coreutils program code")
+    test_include_lines: list[str] = dspy.InputField(description="The lines appended to program_code that include each test file, in the same order as target_function_names")
+    target_function_names: list[str] = dspy.InputField(description="Names of the functions to test, one test file each")
+    tests_c_files: list[str] = dspy.OutputField(description="One complete Unity test file per target function, in the same order as target_function_names")
+
+BatchFunctionToUnityTests = BatchFunctionToUnityTests.with_instructions(
+    "You will be given several target functions instead of one. For EACH of them, independently follow "
+    "the instructions below (with {function_name} standing for that function) and return the resulting "
+    "test files as a list, in the same order as target_function_names.\n"
+    + FunctionToUnityTests.instructions)
+
+_converter = None
+_batch_converter = None
+_llm_lock = threading.Lock()
+
 def initialize_llm():
     """
     Initialize the LLM once and return the configured converter.
-    This should be called once at the start of the program.
+    Later calls in the same process return the same converter (and LM client).
     """
+    global _converter
+    with _llm_lock:
+        if _converter is None:
+            _converter = _initialize_converter()
+    return _converter
+
+def _initialize_converter():
+    """Build the LM, point dspy at it and return a FunctionToUnityTests converter."""
     print("Initializing LLM...")
     lm = dspy.LM(
         "gpt-5",
         model_type="chat",
         temperature=1.0,
         max_tokens=16000,  # these are required by gpt5
+        cache=LLM_CACHE,
     )
     dspy.configure(lm=lm)
     converter = dspy.ChainOfThought(FunctionToUnityTests)
     print("  ✓ LLM initialized successfully")
     return converter
 
+def initialize_batch_llm():
+    """Like initialize_llm, for the BatchFunctionToUnityTests converter."""
+    global _batch_converter
+    initialize_llm()
+    with _llm_lock:
+        if _batch_converter is None:
+            _batch_converter = dspy.ChainOfThought(BatchFunctionToUnityTests)
+    return _batch_converter
+
 def fix_stdout_stderr(code):
     """Add fflush calls before fork() to prevent duplicate output in child processes."""
     if "pid_t pid = fork();" in code:
@@ -149,7 +262,8 @@ def fix_stdout_stderr(code):
     return code
 
 
-def generate_unity_tests_with_llm(converter, program_name, program_code, target_function_name):
+def generate_unity_tests_with_llm(converter, program_name, program_code, test_include_line, target_function_name,
+                                  prompt_cache_key=None):
     """
     Generate Unity tests using a pre-initialized LLM converter.
     
@@ -157,7 +271,9 @@ def generate_unity_tests_with_llm(converter, program_name, program_code, target_
         converter: Pre-initialized dspy.ChainOfThought(FunctionToUnityTests) instance
         program_name: The coreutils program name
         program_code: The coreutils program code (e.g., "cat.c")
+        test_include_line: The #include of the generated test file, appended to program_code
         target_function_name: Name of the specific function to test
+        prompt_cache_key: Optional OpenAI prompt_cache_key, shared by requests with a common prefix
     Returns:
         String containing the generated C code, or False on failure
     """
@@ -165,66 +281,93 @@ def generate_unity_tests_with_llm(converter, program_name, program_code, target_
         print(f"  Generating tests for {target_function_name}...")
         
         # Generate the Unity tests
+        config = {"extra_body": {"prompt_cache_key": prompt_cache_key}} if prompt_cache_key else {}
         result = converter(
             program_name=program_name,
             program_code=program_code,
-            target_function_name=target_function_name
+            test_include_line=test_include_line,
+            target_function_name=target_function_name,
+            config=config
         )
 
         print(f"  ✓ LLM generation completed for {target_function_name}")
         
-        # Extract the generated tests.c code
-        tests_c = result.tests_c.strip()
-        
-        # Check if generation failed (empty string)
-        if not tests_c:
-            print(f"  ✗ LLM returned empty tests for {target_function_name}")
-            return False
-        
-        # Remove markdown code blocks if present
-        if "```c" in tests_c:
-            tests_c = tests_c.split("```c")[1].split("```")[0]
-        elif "```" in tests_c:
-            tests_c = tests_c.split("```")[1].split("```")[0]
-
-        # Fix stdout/stderr flushing before fork
-        tests_c = fix_stdout_stderr(tests_c)
-        
-        return tests_c.strip()
+        return clean_generated_tests(result.tests_c, target_function_name)
         
     except Exception as e:
         print(f"  ✗ Error generating tests with LLM for {target_function_name}: {e}")
         return False
 
+def clean_generated_tests(tests_c, target_function_name):
+    """Turn an LLM tests_c output into the C file contents, or False if it is empty."""
+    # Extract the generated tests.c code
+    tests_c = tests_c.strip()
+    
+    # Check if generation failed (empty string)
+    if not tests_c:
+        print(f"  ✗ LLM returned empty tests for {target_function_name}")
+        return False
+    
+    # Remove markdown code blocks if present
+    m = C_FENCE.search(tests_c) or FENCE.search(tests_c)
+    if m:
+        tests_c = m.group(1)
 
+    # Fix stdout/stderr flushing before fork
+    tests_c = fix_stdout_stderr(tests_c)
+    
+    return tests_c.strip()
 
-def remove_main_with_treesitter(c_file, parser):
-    """Use tree-sitter to remove main() function from C file"""
-    # Read the file
-    with open(c_file, 'rb') as f:
-        source_code = f.read()
+def generate_unity_tests_batch_with_llm(program_name, program_code, targets, prompt_cache_key=None):
+    """
+    Generate Unity tests for several functions with one LLM request.
     
-    # Parse the code
-    tree = parser.parse(source_code)
+    Args:
+        program_name: The coreutils program name
+        program_code: The coreutils program code (without any test include)
+        targets: List of (target_function_name, test include line)
+        prompt_cache_key: Optional OpenAI prompt_cache_key, shared by requests with a common prefix
+    Returns:
+        List with, per target, the generated C code or False on failure. Targets the
+        batched answer does not cover are retried with one request each.
+    """
+    names = [name for name, _ in targets]
+    results = [False] * len(targets)
+    if len(targets) > 1:
+        try:
+            print(f"  Generating tests for {len(names)} functions: {', '.join(names)}...")
+            config = {"extra_body": {"prompt_cache_key": prompt_cache_key}} if prompt_cache_key else {}
+            result = initialize_batch_llm()(
+                program_name=program_name,
+                program_code=program_code,
+                test_include_lines=[include_line for _, include_line in targets],
+                target_function_names=names,
+                config=config
+            )
+            if len(result.tests_c_files) == len(names):
+                print(f"  ✓ LLM generation completed for {', '.join(names)}")
+                results = [clean_generated_tests(tests_c, name) for tests_c, name in zip(result.tests_c_files, names)]
+            else:
+                print(f"  ✗ LLM returned {len(result.tests_c_files)} test files for {len(names)} functions")
+        except Exception as e:
+            print(f"  ✗ Error generating batched tests with LLM for {', '.join(names)}: {e}")
+
+    converter = initialize_llm()
+    for i, (name, include_line) in enumerate(targets):
+        if not results[i]:
+            results[i] = generate_unity_tests_with_llm(converter, program_name, program_code, include_line, name,
+                                                       prompt_cache_key)
+    return results
+
+
+
+def remove_main_with_treesitter(source_code, tree):
+    """Use tree-sitter to remove main() function from C source bytes (tree parsed from them)"""
     root_node = tree.root_node
     
-    # Find main function
-    def find_main_function(node):
-        if node.type == 'function_definition':
-            # Check if this is the main function
-            for child in node.children:
-                if child.type == 'function_declarator':
-                    for subchild in child.children:
-                        if subchild.type == 'identifier' and source_code[subchild.start_byte:subchild.end_byte] == b'main':
-                            return node
-        
-        for child in node.children:
-            result = find_main_function(child)
-            if result:
-                return result
-        return None
-    
-    main_node = find_main_function(root_node)
+    # Find main function (the first definition, as matches come back in source order)
+    matches = function_matches(MAIN_QUERY, root_node)
+    main_node = matches[0][1]['function'][0] if matches else None
     
     if main_node:
         # Remove the main function
@@ -233,28 +376,18 @@ def remove_main_with_treesitter(c_file, parser):
         
         new_source = source_code[:start_byte] + source_code[end_byte:]
         
-        print(f"  ✓ Removed main() from {c_file}")
+        print(f"  ✓ Removed main()")
         return new_source
     else:
-        print(f"  ⚠ No main() found in {c_file}")
+        print(f"  ⚠ No main() found")
         return source_code
 
-def append_include_line_to_code(code_without_main, include_line):
-    """Return new code string with include_line appended if absent."""
-    lines = code_without_main.splitlines()
-    if include_line in lines:
-        return '\n'.join(lines) + '\n'  # unchanged (but normalized newline)
-    lines.append(include_line)
-    return '\n'.join(lines) + '\n'
-
 def extract_program_name(c_file):
     """Extract program name from .c file (e.g., cat.c -> cat)"""
     return Path(c_file).stem
 
 
-def generate_tests_for_one_coreutils_program(program_name):
-    C_LANGUAGE = Language(tsc.language())
-    parser = Parser(C_LANGUAGE)
+def generate_tests_for_one_coreutils_program(program_name, parser=PARSER):
     # print(f"Generating Unity tests for {program_name}...")
 
     src_c_path = os.path.join(HOST_COREUTILS_PATH, 'src', f"{program_name}.c")
@@ -271,20 +404,23 @@ def generate_tests_for_one_coreutils_program(program_name):
     
     injectable_json_path = os.path.join(INJECTABLE_FUNCTION_PATH, f"{program_name}_injectable_functions.json")
 
-    with open(src_c_path, 'r') as f:
-        original_code = f.read()
+    # Read and parse the file (at most) once for both main() removal and function extraction
+    code_without_main, function_info = load_program(src_c_path, parser)
+    code_without_main = code_without_main.decode('utf-8')
 
-    code_without_main = remove_main_with_treesitter(src_c_path, parser).decode('utf-8')
-    function_info = get_function_info(src_c_path, parser)
-
-    # Initialize LLM once for all functions
-    converter = initialize_llm()
-    
     injectable_functions = []
+    targets = []
+    # Route all of this program's requests to the same OpenAI prompt-cache shard
+    prompt_cache_key = f"{program_name}-{hashlib.sha256(code_without_main.encode('utf-8')).hexdigest()[:16]}"
+    # Every prompt sends this same program code; the test includes go in their own field
+    base_code = code_without_main if code_without_main.endswith('\n') else code_without_main + '\n'
 
     for i, func in enumerate(function_info, 1):
         function_name = func['name']
-        function_name_clean = re.sub(r'[^0-9a-zA-Z_]', '_', function_name)
+        if function_name.isascii():
+            function_name_clean = function_name.translate(IDENTIFIER_CLEAN_TABLE)
+        else:
+            function_name_clean = re.sub(r'[^0-9a-zA-Z_]', '_', function_name)
         function_signature = func['signature']
         include_line = f'#include "../tests/{program_name}/tests_for_{function_name_clean}.c"'
 
@@ -296,29 +432,48 @@ def generate_tests_for_one_coreutils_program(program_name):
             "include_line": include_line
         })
 
-        code_with_test_include = append_include_line_to_code(code_without_main, include_line)
-        
-        # Reuse the same converter for all functions
-        tests_c_result = generate_unity_tests_with_llm(
-            converter,
-            program_name, 
-            code_with_test_include, 
-            function_signature
-        )
-
-        # Write test file for this function
         tests_c_per_function_path = os.path.join(tests_dir_path, f"tests_for_{function_name_clean}.c")
-        if tests_c_result:
-            print(f"  ✓ Writing generated tests to {tests_c_per_function_path}")
-            with open(tests_c_per_function_path, "w") as f:
-                f.write(tests_c_result)
-        else:
-            print(f"  ✗ Failed to generate tests for function: {function_name}")
+        targets.append((function_name, function_signature, include_line, tests_c_per_function_path))
+
+    # Requests are independent and spend their time waiting on the API, so run
+    # LLM_WORKERS of them at once, each covering up to LLM_BATCH_SIZE functions;
+    # test files are handed to the writer pool as their request completes
+    with ThreadPoolExecutor(max_workers=LLM_WORKERS) as executor, \
+            ThreadPoolExecutor(max_workers=TEST_WRITER_WORKERS) as writer_pool:
+        futures = {}
+        for start in range(0, len(targets), LLM_BATCH_SIZE):
+            batch = targets[start:start + LLM_BATCH_SIZE]
+            future = executor.submit(
+                generate_unity_tests_batch_with_llm,
+                program_name,
+                base_code,
+                [(function_signature, include_line) for _, function_signature, include_line, _ in batch],
+                prompt_cache_key
+            )
+            futures[future] = batch
+
+        writes = []
+        for future in as_completed(futures):
+            for (function_name, _, _, tests_c_per_function_path), tests_c_result in zip(futures[future], future.result()):
+                # Write test file for this function
+                if tests_c_result:
+                    print(f"  ✓ Writing generated tests to {tests_c_per_function_path}")
+                    writes.append(writer_pool.submit(Path(tests_c_per_function_path).write_text, tests_c_result))
+                else:
+                    print(f"  ✗ Failed to generate tests for function: {function_name}")
+
+        # Surface any write error before the metadata claims the files exist
+        for write in writes:
+            write.result()
 
     # Save injectable functions metadata
     # print(f"\n  Writing injectable functions metadata to {injectable_json_path}")
-    with open(injectable_json_path, "w") as f:
-        json.dump(injectable_functions, f, indent=2)
+    if orjson is not None:
+        with open(injectable_json_path, "wb") as f:
+            f.write(orjson.dumps(injectable_functions, option=orjson.OPT_INDENT_2))
+    else:
+        with open(injectable_json_path, "w") as f:
+            json.dump(injectable_functions, f, indent=2)
 
     # print("\n" + "="*60)
     # print("COMPLETE")
@@ -0,0 +1,26 @@
+"""
+Message framing between the host and test_harness.py: every message is a
+4-byte big-endian payload length followed by that many bytes of UTF-8 JSON,
+so payloads may span lines and are read without scanning for a newline.
+"""
+
+HEADER_SIZE = 4
+
+
+def read_message(stream):
+    """Read one framed payload (bytes) from a binary stream; None at end of input."""
+    header = stream.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        return None
+    length = int.from_bytes(header, 'big')
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise EOFError(f"truncated message: expected {length} bytes, got {len(payload)}")
+    return payload
+
+
+def write_message(stream, payload):
+    """Write one framed payload (bytes) to a binary stream and flush it."""
+    stream.write(len(payload).to_bytes(HEADER_SIZE, 'big'))
+    stream.write(payload)
+    stream.flush()
@@ -3,7 +3,8 @@ Interactive Coreutils Test Harness
 
 Reads JSON payloads from stdin, writes/updates source files inside
 the container, builds and runs specified programs, and returns results
-as JSON to stdout.
+as JSON to stdout. Both directions use the length-prefixed framing in
+container_protocol.py.
 
 Payload format:
 {
@@ -16,6 +17,10 @@ Payload format:
         "src/foo.c": "int foo() { return 0; }"
     }
 }
+
+Each injectable is built and run on its own (src/<program>.c plus that one
+include); the response is {"program": ..., "results": [...]} with one entry
+per injectable.
 """
 
 import json
@@ -25,15 +30,136 @@ from pathlib import Path
 from container_protocol import *
 import os
 import sys
+
+try:
+    import orjson
+except ImportError:  # optional: faster (de)serialization of every message
+    orjson = None
+
 cwd = Path.cwd()
 
 
 COREUTILS_SRC = Path("/workdir/coreutils")
 
+# Sticky compiler cache: object files survive harness restarts, so a payload only
+# recompiles the translation units it actually changed
+CCACHE_DIR = Path("/workdir/.ccache")
+BUILD_ENV = dict(os.environ, CC="ccache clang-14", CCACHE_DIR=str(CCACHE_DIR), FORCE_UNSAFE_CONFIGURE="1")
+BUILD_TIMEOUT = 300
+RUN_TIMEOUT = 120
+# Only the tail of build/test output is sent back
+OUTPUT_TAIL_CHARS = 8000
+
+
+def prewarm_build_tree() -> None:
+    """
+    Configure and build the whole tree once, so each payload only pays for
+    `make src/<program>` (one compile + link) instead of configure + full make.
+    Build output goes to stderr: stdout carries the protocol messages.
+    """
+    if (COREUTILS_SRC / "Makefile").exists():
+        return
+    print("pre-warming build tree (configure + make)...", file=sys.stderr)
+    jobs = str(os.cpu_count() or 1)
+    for cmd in (["./configure", "--config-cache"], ["make", f"-j{jobs}"]):
+        try:
+            r = subprocess.run(cmd, cwd=COREUTILS_SRC, env=BUILD_ENV, stdin=subprocess.DEVNULL,
+                               stdout=sys.stderr, stderr=sys.stderr)
+            error = f"exit code {r.returncode}" if r.returncode != 0 else None
+        except OSError as e:  # e.g. no ./configure generated yet
+            error = str(e)
+        if error:
+            # leave it to the per-payload builds, which report their errors in the response
+            print(f"pre-warm step {cmd} failed: {error}", file=sys.stderr)
+            return
+
+
+def tail(text: str) -> str:
+    return text[-OUTPUT_TAIL_CHARS:]
+
+
+def write_extra_files(data: dict) -> None:
+    """Write the payload's extra_files into the coreutils tree."""
+    for rel_path, content in data.get("extra_files", {}).items():
+        path = (COREUTILS_SRC / rel_path).resolve()
+        if COREUTILS_SRC.resolve() not in path.parents:
+            raise ValueError(f"extra_files path outside the coreutils tree: {rel_path}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def source_with_tests(source: str, program: str, include_line: str) -> str:
+    """
+    The program's source with one test file included. The program's own main()
+    is renamed out of the way (there is no C parser in the container to strip
+    it), so the Unity file's main() is the one that gets linked.
+    """
+    if not source.endswith("\n"):
+        source += "\n"
+    return f"#define main {program.replace('[', '_')}_program_main\n{source}#undef main\n{include_line}\n"
+
+
+def build_and_run(program: str) -> dict:
+    """`make src/<program>` and run it; returns built/passed/returncode and the output tails."""
+    # Only this target: unchanged objects are up to date, and ccache serves any
+    # translation unit that make decides to rebuild with unchanged input
+    try:
+        build = subprocess.run(["make", f"-j{os.cpu_count() or 1}", f"src/{program}"], cwd=COREUTILS_SRC,
+                               env=BUILD_ENV, stdin=subprocess.DEVNULL, capture_output=True,
+                               text=True, errors="replace", timeout=BUILD_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return {"built": False, "error": f"Build timed out after {BUILD_TIMEOUT}s"}
+    result = {"built": build.returncode == 0}
+    if build.returncode != 0:
+        result.update(returncode=build.returncode, stdout=tail(build.stdout), stderr=tail(build.stderr))
+        return result
+
+    try:
+        run = subprocess.run([f"./src/{program}"], cwd=COREUTILS_SRC, stdin=subprocess.DEVNULL,
+                             capture_output=True, text=True, errors="replace", timeout=RUN_TIMEOUT)
+    except subprocess.TimeoutExpired as e:
+        stdout = e.stdout.decode("utf-8", "replace") if isinstance(e.stdout, bytes) else (e.stdout or "")
+        stderr = e.stderr.decode("utf-8", "replace") if isinstance(e.stderr, bytes) else (e.stderr or "")
+        result.update(timed_out=True, passed=False, returncode=None, stdout=tail(stdout), stderr=tail(stderr))
+        return result
+
+    # Same rule as the host pipeline: "FAIL" in stdout is a failing test
+    result.update(timed_out=False, passed=run.returncode == 0 and "FAIL" not in run.stdout,
+                  returncode=run.returncode, stdout=tail(run.stdout), stderr=tail(run.stderr))
+    return result
+
+
 def compile_and_run_tests(data: dict) -> dict:
-    """Compile program with test file and run"""
-    #to be implemented
-    pass
+    """
+    Compile program with test file and run, once per injectable: each build sees
+    only its own test file. src/<program>.c is restored afterwards.
+    """
+    program = data.get("program")
+    if not program or not re.fullmatch(r"[\w\[-]+", program):
+        return {"error": f"Invalid program name: {program!r}"}
+
+    source_path = COREUTILS_SRC / "src" / f"{program}.c"
+    try:
+        write_extra_files(data)
+        # extra_files may replace the program source, so read it after writing them
+        pristine = source_path.read_text()
+    except (OSError, ValueError) as e:
+        return {"program": program, "error": f"Could not write sources: {e}"}
+
+    results = []
+    try:
+        for injectable in data.get("injectables", []):
+            function_name = injectable.get("function_name")
+            include_line = injectable.get("include_line")
+            if not include_line:
+                results.append({"function_name": function_name, "built": False, "error": "no include_line"})
+                continue
+            source_path.write_text(source_with_tests(pristine, program, include_line))
+            results.append({"function_name": function_name, **build_and_run(program)})
+    finally:
+        source_path.write_text(pristine)
+
+    return {"program": program, "results": results}
 
 
 def handle_payload(data: dict) -> dict:
@@ -48,17 +174,35 @@ def handle_payload(data: dict) -> dict:
     return compile_and_run_tests(data)
 
 
+def send(result) -> None:
+    if orjson is not None:
+        write_message(sys.stdout.buffer, orjson.dumps(result))
+    else:
+        write_message(sys.stdout.buffer, json.dumps(result).encode('utf-8'))
+
+
+def decode(payload: bytes) -> dict:
+    """Parse a message payload; raises ValueError (json.JSONDecodeError or orjson's) if invalid."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
 def main():
+    prewarm_build_tree()
     while True:
+        payload = read_message(sys.stdin.buffer)
+        if payload is None:
+            break
         try:
-            data = json.loads(input())
+            data = decode(payload)
             print("data received:", data, file=sys.stderr)
-        except json.JSONDecodeError as e:
-            print(json.dumps({"error": f"Invalid JSON: {str(e)}"}), flush=True)
+        except ValueError as e:
+            send({"error": f"Invalid JSON: {str(e)}"})
             continue
 
         result = handle_payload(data)
-        print(json.dumps(result), flush=True)
+        send(result)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file